@@ -23,7 +23,7 @@
 import pyqtgraph as pg
 from pyqtgraph.Qt import QtWidgets, QtGui, QtCore
 import numpy as np
-import sys, cv2
+import sys, math, collections, cv2
 
 VERSION_INFO = 'version 2.5'
 CHANGELOG = """Changelog:
@@ -31,6 +31,7 @@ Version 2.5 (19 June 2021):
     - Swapped out Matplotlib for PyQtGraph for better video performance.
     - Added LUT (lookup-table) to change different levels of red-green-blue.
     - Added image/frame grayscale converter as tickbox in the GUI.
+    - Added y-key to restore the previously removed dot, together with the 'frame_cache_size' and 'backend' video parameters.
 Version 2.4 (26 May 2021):
     - Refactoring.
     - Bug fix: When setting the 'frame' parameter, the initial frame now corresponds to this value.
@@ -60,24 +61,36 @@ Version 2.0 (16 May 2021):
 Version 1.0 (9 May 2021):
     - Simple single class image processor using a Matplotlib GUI and its events.
 """
+MAX_GRABBED_FRAMES = 30 # Forward jumps in a video up to this many frames are grabbed instead of seeked
 DOCUMENTATION = """Please view the documentation on the <a href="https://github.com/JitseB/ImageP/blob/main/DOCUMENTATION.md">GitHub repository</a>."""
 
+def _angle(A, B, C):
+    """Internal function that returns angle CAB (between the lines AC and AB) in degrees, or None if it is undefined"""
+    # Using atan2 of the cross and dot product of AC and AB, which needs no square roots and is well defined between 0 and 180 degrees
+    ux, uy = C[0]-A[0], C[1]-A[1]
+    vx, vy = B[0]-A[0], B[1]-A[1]
+    cross, dot = ux*vy-uy*vx, ux*vx+uy*vy
+    if cross == 0 and dot == 0: return None # B or C coincides with A
+    return math.degrees(math.atan2(abs(cross), dot))
+
 class PlotWidget(QtWidgets.QWidget):
     point_add_event = QtCore.pyqtSignal(tuple)
     point_remove_last_event = QtCore.pyqtSignal()
+    point_restore_last_event = QtCore.pyqtSignal()
     origin_change_event = QtCore.pyqtSignal(tuple)
     mouse_move_event = QtCore.pyqtSignal(tuple)
     
     """Qt widget to hold the PyQtGraph widget and the tools for interacting with the plot"""
     def __init__(self, window):
         QtWidgets.QWidget.__init__(self)
-        self.image = np.flipud(np.rot90(window.image))
+        self.image = window.image
         self.color = window.color
         self._shift_active = False
         self.origin_move_active = False
         self._grayscale_active = False
-        
-        self.canvas = pg.ImageView()
+        self._grayscale = None # Grayscale version of the current image, converted when first needed
+        self._grayscale_buffer = None # Output buffer of the last grayscale conversion
+        self._last_mouse_position = None
 
         # Use a grid layout for the plot, LUT and settings (with title)
         # Since the settings and LUT only need local referencing, we do not have to create a seperate class
@@ -87,13 +100,19 @@ class PlotWidget(QtWidgets.QWidget):
         self.lut = pg.HistogramLUTWidget()
         layout.addWidget(self.lut, 1, 1)
 
-        self._plt = pg.plot()
+        # Embedded plot widget, pg.plot() would also show it as a top-level window and keep a global reference to it
+        self._plt = pg.PlotWidget()
         self._plt.setAspectLocked(True)
+        self._view = self._plt.plotItem.vb # Cached for the mouse handlers
 
-        self.img = pg.ImageItem(self.image)
+        # Row-major axis order matches the (row, column) layout of the image, so it does not have to be transposed
+        self.img = pg.ImageItem(self.image, axisOrder='row-major')
         self.img.setZValue(-10)
 
         self.scatter = pg.ScatterPlotItem(pen=None, brush=pg.mkBrush(self.color))
+        # Keep the rendered image and dots as cached pixmaps, redraws that do not change them (e.g. the origin lines) just blit those
+        self.img.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
+        self.scatter.setCacheMode(QtWidgets.QGraphicsItem.DeviceCoordinateCache)
         self._plt.addItem(self.scatter)
 
         self._plt.addItem(self.img)
@@ -103,11 +122,15 @@ class PlotWidget(QtWidgets.QWidget):
         layout.addWidget(self._plt, 0, 0, 5, 1)
 
         self.lut.setImageItem(self.img)
+        # Histogram refresh for new frames, delayed so that scrubbing through a video only computes it once it pauses
+        self._histogram_timer = QtCore.QTimer(self)
+        self._histogram_timer.setSingleShot(True)
+        self._histogram_timer.setInterval(150)
+        self._histogram_timer.timeout.connect(self.lut.item.imageChanged)
         
         # Settings (with title)
-        label = QtWidgets.QLabel('<span style="font-weight:bold">Keymap:</span><br><span style="text-decoration:underline">Shift-click</span>: Add new point<br><span style="text-decoration:underline">Z</span>: Remove last point<br><span style="text-decoration:underline">Left/right arrow</span>: Change frame<br><br><span style="font-weight:bold">Image post-processing:</span>')
+        label = QtWidgets.QLabel('<span style="font-weight:bold">Keymap:</span><br><span style="text-decoration:underline">Shift-click</span>: Add new point<br><span style="text-decoration:underline">Z</span>: Remove last point<br><span style="text-decoration:underline">Y</span>: Restore removed point<br><span style="text-decoration:underline">Left/right arrow</span>: Change frame<br><br><span style="font-weight:bold">Image post-processing:</span>')
         layout.addWidget(label, 0, 1)
-        grayBox = QtWidgets.QCheckBox('grayscale')
         monoRadio = QtWidgets.QRadioButton('mono')
         rgbaRadio = QtWidgets.QRadioButton('rgba')
         grayBox = QtWidgets.QCheckBox('grayscale')
@@ -119,8 +142,7 @@ class PlotWidget(QtWidgets.QWidget):
         # Grayscale click action
         def setGrayscale(state):
             if state == QtCore.Qt.Checked:
-                # Convert rgb image to gray image using std formula
-                self.img.setImage(np.dot(self.image[...,:3], [0.299, 0.587, 0.114]))
+                self.img.setImage(self._get_grayscale())
                 monoRadio.setChecked(True)
                 rgbaRadio.setChecked(False)
                 rgbaRadio.setEnabled(False)
@@ -135,7 +157,7 @@ class PlotWidget(QtWidgets.QWidget):
         monoRadio.toggled.connect(lambda _: self.lut.setLevelMode('mono' if monoRadio.isChecked() else 'rgba'))
 
         # Disable the grayscale and rgb buttons if the image dooes not have rgb data
-        if len(self.image.shape) < 3: 
+        if self.image.ndim < 3: 
             grayBox.setEnabled(False)
             rgbaRadio.setEnabled(False)
 
@@ -146,7 +168,7 @@ class PlotWidget(QtWidgets.QWidget):
         self._plt.addItem(self._origin_hline, ignoreBounds=True)
 
         # Connect the signal proxies and events
-        self._mouse_move_proxy = pg.SignalProxy(self._plt.scene().sigMouseMoved, rateLimit=60, slot=self._mouse_move_handler)
+        self._mouse_move_proxy = pg.SignalProxy(self._plt.scene().sigMouseMoved, rateLimit=30, slot=self._mouse_move_handler)
         self._mouse_click_proxy = pg.SignalProxy(self._plt.scene().sigMouseClicked, rateLimit=60, slot=self._mouse_click_handler)
         window.key_press_event.connect(self._key_press_handler)
         window.key_release_event.connect(self._key_release_handler)
@@ -155,6 +177,7 @@ class PlotWidget(QtWidgets.QWidget):
     def _key_press_handler(self, key):
         if key == QtCore.Qt.Key_Shift: self._shift_active = True
         elif key == QtCore.Qt.Key_Z: self.point_remove_last_event.emit()
+        elif key == QtCore.Qt.Key_Y: self.point_restore_last_event.emit()
         
     def _key_release_handler(self, key):
         if key == QtCore.Qt.Key_Shift: self._shift_active = False
@@ -162,17 +185,22 @@ class PlotWidget(QtWidgets.QWidget):
     def _mouse_move_handler(self, event):
         pos = event[0] # Using signal proxy turns original arguments into a tuple
         if self._plt.sceneBoundingRect().contains(pos):
-            mouse_position = self._plt.plotItem.vb.mapSceneToView(pos)
-            self.mouse_move_event.emit((mouse_position.x(), mouse_position.y()))
+            mouse_position = self._view.mapSceneToView(pos)
+            position = (mouse_position.x(), mouse_position.y())
+            # The signal proxy already coalesces the events, skip the ones that did not move the cursor
+            if position == self._last_mouse_position: return
+            self._last_mouse_position = position
+            self.mouse_move_event.emit(position)
 
             if self.origin_move_active:
-                self._origin_hline.setPos(mouse_position.y())
-                self._origin_vline.setPos(mouse_position.x())
-                self.origin_change_event.emit((mouse_position.x(), mouse_position.y()))
+                self._origin_hline.setPos(position[1])
+                self._origin_vline.setPos(position[0])
+                self.origin_change_event.emit(position)
 
     def _mouse_click_handler(self, event):
-        if event[0] == None: return # Prevent attribute error
-        pos = event[0].pos() # Using signal proxy turns original arguments into a tuple
+        event = event[0] # Using signal proxy turns original arguments into a tuple
+        if event is None: return # Prevent attribute error
+        pos = event.pos()
         if self.origin_move_active:
             self.origin_move_active = False
             return
@@ -181,24 +209,39 @@ class PlotWidget(QtWidgets.QWidget):
 
     def update_points(self, points):
         """Update the scatter plot with the points"""
-        self.scatter.setData(pos=points)
+        # Points arrive as an (N, 2) array, passing the columns skips the parsing of a 'pos' sequence
+        self.scatter.setData(x=points[:,0], y=points[:,1])
+
+    def append_point(self, point):
+        """Add a single point to the scatter plot, keeping the points already shown"""
+        self.scatter.addPoints(x=[point[0]], y=[point[1]])
 
     # Plot widget functions
     def set_origin(self, position):
         """Change the origin's position to a new location"""
         self.origin = position
-        self.origin_hline.setPos(position[0])
-        self._origin_vline.setPos(position[1])
+        self._origin_hline.setPos(position[1])
+        self._origin_vline.setPos(position[0])
 
     def set_image(self, image):
         """Change the current image that is shown"""
-        self.image = np.flipud(np.rot90(image))
-        # Set image on the view and copy over the levels (LUT)
-        levels = self.lut.getLevels()
-        self.img.setImage(self.image if not self._grayscale_active else np.dot(self.image[...,:3], [0.299, 0.587, 0.114]))
-        if self.lut.levelMode == 'mono': self.lut.setLevels(min=levels[0], max=levels[1])
-        else: self.lut.setLevels(rgba=levels)
-        self.lut.regionChanged() # Tell PyQtGrapg the LUT regions have changed to update the image view
+        self.image = image
+        self._grayscale = None
+        # Set image on the view, without auto levels the image keeps the levels set with the LUT
+        # Signals are blocked so the LUT does not compute the histogram of every frame, the timer refreshes it instead
+        self.img.blockSignals(True)
+        self.img.setImage(self.image if not self._grayscale_active else self._get_grayscale(), autoLevels=False)
+        self.img.blockSignals(False)
+        self._histogram_timer.start()
+
+    def _get_grayscale(self):
+        """Internal function to convert the current rgb image to a gray image using std formula"""
+        # OpenCV's vectorized uint8 kernel, instead of a float64 dot product over the whole image
+        # The result is kept until the image changes, so toggling the checkbox does not convert again
+        # Frames of a video all have the same size, so each one is converted into the buffer of the previous one
+        # Images are contiguous RGB (see gui and VideoWindow), a strided view would make OpenCV copy it before converting
+        if self._grayscale is None: self._grayscale = self._grayscale_buffer = cv2.cvtColor(self.image, cv2.COLOR_RGB2GRAY, dst=self._grayscale_buffer)
+        return self._grayscale
 
 class CalibrationDialog(QtWidgets.QDialog):
     """Qt dialog class for the calibration popup"""
@@ -215,11 +258,16 @@ class CalibrationDialog(QtWidgets.QDialog):
 
         self.layout = QtWidgets.QFormLayout()
         self.layout.addRow(QtWidgets.QLabel('Enter the size of each pixel and provide a unit'))
+        # Use the C locale without group separators, so that every accepted value can be parsed by float()
+        locale = QtCore.QLocale.c()
+        locale.setNumberOptions(QtCore.QLocale.RejectGroupSeparator)
+        self._validator = QtGui.QDoubleValidator()
+        self._validator.setLocale(locale)
         self.xedit = QtWidgets.QLineEdit()
-        self.xedit.setValidator(QtGui.QDoubleValidator())
+        self.xedit.setValidator(self._validator)
         self.layout.addRow('X-direction pixel size', self.xedit)
         self.yedit = QtWidgets.QLineEdit()
-        self.yedit.setValidator(QtGui.QDoubleValidator())
+        self.yedit.setValidator(self._validator)
         self.layout.addRow('Y-direction pixel size', self.yedit)
         self.unitedit = QtWidgets.QLineEdit()
         self.layout.addRow('Unit', self.unitedit)
@@ -239,10 +287,10 @@ class CalibrationDialog(QtWidgets.QDialog):
         This internal function adds a bit of functionality to the self.accept function, it
         checks whether the entered values are numbers. If not, an error dialog will show.
         """
-        try:
-            self.get_xy_calibration()
-            self.accept()
-        except Exception as e:
+        # Ask the validator directly instead of catching the exception thrown by float()
+        states = [self._validator.validate(edit.text(), 0)[0] for edit in (self.xedit, self.yedit)]
+        if all(state == QtGui.QValidator.Acceptable for state in states): self.accept()
+        else:
             msg = QtWidgets.QMessageBox()
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setText('An error occurred!')
@@ -262,7 +310,16 @@ class ImageWindow(QtWidgets.QMainWindow):
         self.calibration = calibration
         self.unit = unit # Default unit is pixels
         self.color = color
-        self.points = []
+        # Clicked points are kept in a growable buffer, only the first '_npoints' rows are in use
+        self._points = np.empty((16, 2), dtype=np.float64)
+        self._npoints = 0
+        self._removed_points = collections.deque(maxlen=64) # Points removed with the z-key that can be restored
+        self._update_calibration()
+
+    @property
+    def points(self):
+        """The clicked points (in pixels) as an (N, 2) array"""
+        return self._points[:self._npoints]
 
     def closeEvent(self, event):
         # Needed to properly quit when running in IPython console / Spyder IDE
@@ -288,6 +345,7 @@ class ImageWindow(QtWidgets.QMainWindow):
         self.plotwidget = PlotWidget(self)
 
         self.plotwidget.point_remove_last_event.connect(self.point_remove_last_listener)
+        self.plotwidget.point_restore_last_event.connect(self.point_restore_last_listener)
         self.plotwidget.point_add_event.connect(self.point_add_listener)
         self.plotwidget.mouse_move_event.connect(self._update_statusbar_handler)
         self.plotwidget.origin_change_event.connect(self._origin_change_listener)
@@ -321,26 +379,65 @@ class ImageWindow(QtWidgets.QMainWindow):
         self.angle_label = QtWidgets.QLabel('Angle: -')
         self.statusbar.addWidget(self.angle_label)
 
+        # Mouse moves only store the latest position, the labels are refreshed at most once every 30 ms
+        self._mouse_position = None
+        self._statusbar_timer = QtCore.QTimer(self)
+        self._statusbar_timer.setSingleShot(True)
+        self._statusbar_timer.setInterval(30)
+        self._statusbar_timer.timeout.connect(self._update_statusbar)
+
     def point_remove_last_listener(self):
         """Remove that last clicked point (operated with z-key)"""
-        if len(self.points) > 0: 
-            self.points = self.points[:-1]
+        if self._npoints > 0: 
+            self._npoints -= 1
+            self._removed_points.append(tuple(self._points[self._npoints]))
+            self._update_last_calibrated()
             self.plotwidget.update_points(self.points)
 
+    def point_restore_last_listener(self):
+        """Restore the last removed point (operated with y-key), returns whether there was a point to restore"""
+        if len(self._removed_points) == 0: return False
+        point = self._removed_points.pop()
+        self._append_point(point)
+        self._update_last_calibrated()
+        self.plotwidget.append_point(point)
+        return True
+
     def point_add_listener(self, point):
         """When a point is clicked, add it to the list and update the scatter plot"""
-        self.points.append(point)
-        self.plotwidget.update_points(self.points)
-
-    def get_relative_calibrated(self, point):
-        """Get point position relative to origin and apply calibration"""
-        # First position the points relative to the origin, then multiply by their calibration factors
-        return ((point[0]-self.origin[0])*self.calibration[0], ((self.origin[1]-point[1])*self.calibration[1]))
+        self._removed_points.clear() # A new point starts a new history, like any undo/redo
+        self._append_point(point)
+        self._update_last_calibrated()
+        self.plotwidget.append_point(point) # Only undoing a point redraws the whole scatter plot
+
+    def _append_point(self, point):
+        """Internal function to append a point to the buffer, doubling its capacity when it is full"""
+        if self._npoints == len(self._points): self._points = np.concatenate((self._points, np.empty_like(self._points)))
+        self._points[self._npoints] = point
+        self._npoints += 1
+
+    def _update_calibration(self):
+        """Internal function to precompute the origin and calibration vectors, call it whenever either one changes"""
+        # The vertical axis counts top to bottom, its sign flip is fused into the calibration vector
+        self._origin_vector = (float(self.origin[0]), float(self.origin[1]))
+        self._calibration_vector = (float(self.calibration[0]), -float(self.calibration[1]))
+
+        # Bind 'get_relative_calibrated' (point position relative to origin with calibration applied) to a function
+        # specialized for the current values, the default pixel calibration does not need any multiplications
+        ox, oy = self._origin_vector
+        cx, cy = self._calibration_vector
+        if cx == 1 and cy == -1: self.get_relative_calibrated = lambda point: (point[0]-ox, oy-point[1])
+        else: self.get_relative_calibrated = lambda point: ((point[0]-ox)*cx, (point[1]-oy)*cy)
+        self._update_last_calibrated()
 
     def get_calibrated_points(self):
         """Returns the array we were after, the calibrated points from the image relative to the origin"""
-        # Convert to NumPy array for easier matrix manipulation
-        return np.array([self.get_relative_calibrated(point) for point in self.points])
+        # Transform all points in one vectorized pass
+        return (self.points-self._origin_vector)*self._calibration_vector
+
+    def _update_last_calibrated(self):
+        """Internal function to cache the calibrated positions of the last two points, these only change on click, undo or recalibration"""
+        self._last_calibrated = [self.get_relative_calibrated(point) for point in self.points[-2:].tolist()]
 
     def _show_documentation_popup(self):
         """Internal function to show the documentation popup window"""
@@ -370,6 +467,7 @@ class ImageWindow(QtWidgets.QMainWindow):
         # Set internal variables
         self.calibration = dialog.get_xy_calibration()
         self.unit = dialog.get_unit()
+        self._update_calibration()
 
     def _enable_moving_origin(self):
         """Internal function to enable movement of the origin"""
@@ -377,45 +475,44 @@ class ImageWindow(QtWidgets.QMainWindow):
 
     def _origin_change_listener(self, origin):
         self.origin = origin
+        self._update_calibration()
 
     def _update_statusbar_handler(self, mouse_position):
+        """Internal function as listener for mouse moves, schedules an update of the statusbar labels"""
+        self._mouse_position = mouse_position
+        if not self._statusbar_timer.isActive(): self._statusbar_timer.start()
+
+    def _update_statusbar(self):
         """Internal function to update the statusbar labels"""
         # All points (A, B and C) are measured from the origin position
-        # Using cosine rule to solve angle (finding angle(CAB), so between the lines AC and AB)
-        C = self.get_relative_calibrated(mouse_position)
+        C = self.get_relative_calibrated(self._mouse_position)
         self.mouse_position_label.setText(f'Position: x={C[0]:.2f} {self.unit}; y={C[1]:.2f} {self.unit}')
-        if len(self.points) >= 1:
-            B = self.get_relative_calibrated(self.points[-1])
-            distanceBC = ((B[0]-C[0])**2+(B[1]-C[1])**2)**(1/2)
+        if self._npoints >= 1:
+            B = self._last_calibrated[-1]
+            distanceBC = math.hypot(B[0]-C[0], B[1]-C[1])
             self.dist_label.setText(f'Distance: {distanceBC:.2f} {self.unit}')
-            if len(self.points) >= 2:
-                A = self.get_relative_calibrated(self.points[-2])
-                distanceAC = ((A[0]-C[0])**2+(A[1]-C[1])**2)**(1/2)
-                distanceAB = ((A[0]-B[0])**2+(A[1]-B[1])**2)**(1/2)
-                try:
-                    argument = (distanceAC**2+distanceAB**2-distanceBC**2)/(2*distanceAC*distanceAB)
-                    if not -1 <= argument <= 1: return # arccos only takes values between -1 and 1
-                    angle = np.arccos(argument)*180/np.pi
-                    self.angle_label.setText(f'Angle: {angle:.2f} deg')
-                except ZeroDivisionError as e: pass
+            if self._npoints >= 2:
+                # Finding angle(CAB), so between the lines AC and AB
+                angle = _angle(self._last_calibrated[0], B, C)
+                if angle is not None: self.angle_label.setText(f'Angle: {angle:.2f} deg')
 
 class VideoWindow(ImageWindow):
     """Class for the video window of ImageP"""
-    def __init__(self, capture, origin, calibration, unit, color, frame, auto_progress, auto_progress_frame_interval):
+    def __init__(self, capture, origin, calibration, unit, color, frame, auto_progress, auto_progress_frame_interval, frame_cache_size=16):
         self.capture = capture
         self.frame = frame
         self.auto_progress = auto_progress
         self.auto_progress_frame_interval = auto_progress_frame_interval
+        self.frame_cache_size = frame_cache_size
         self.max_frame = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))-1
-        self.capture.set(1, frame) # Set the frame number within the VideoCapture object
-        success, image = self.capture.read()
-        if not success: raise Exception('Could not read video capture')
-        # Convert image data to RGB for Matplotlib
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self._next_frame = 0 # Frame the VideoCapture object will decode next (None if unknown)
+        self._frame_cache = collections.OrderedDict() # Recently decoded RGB frames, least recently used first
+        self._decode_buffer = None # BGR buffer the VideoCapture object decodes every frame into
+        self._spare_buffer = None # RGB buffer no longer in use that the next frame is converted into
+        image = self._decode_frame(frame)
+        if image is None: raise Exception('Could not read video capture')
 
-        # The origin point was returned calibrated from the (0, 0) origin, we have to compensate for that...
-        if origin is not None: origin = (origin[0], image.shape[0]-origin[1]) 
-        else: origin = (0, image.shape[0])
+        origin = _image_origin(origin, image.shape[0])
 
         super(VideoWindow, self).__init__(image, origin, calibration, unit, color)
 
@@ -438,18 +535,55 @@ class VideoWindow(ImageWindow):
         if key == QtCore.Qt.Key_Right and self.frame < self.max_frame: self._change_frame(self.frame+1)
         elif key == QtCore.Qt.Key_Left and self.frame > 0:  self._change_frame(self.frame-1)
 
+    def point_restore_last_listener(self):
+        """Extends the image listener so that when auto progressing, using the y-key, it goes forward in time again"""
+        # Mirrors the z-key, which only rolls back when points remain after the removal
+        if super(VideoWindow, self).point_restore_last_listener() and self.auto_progress and self._npoints > 1:
+            if self._change_frame(self.frame + self.auto_progress_frame_interval): self._schedule_prefetch()
+
     def _point_remove_last_listener(self):
         """Additional listener (see image class) so that when auto progressing, using the z-key, it goes back in time"""
         # Roll back the frames when auto-progressing is enabled
-        if self.auto_progress and len(self.points) > 0: self._change_frame(self.frame - self.auto_progress_frame_interval)
+        if self.auto_progress and self._npoints > 0: self._change_frame(self.frame - self.auto_progress_frame_interval)
+
+    def _read_frame(self, frame):
+        """Internal function to decode a frame from the video, returns None if it could not be read"""
+        skip = frame - self._next_frame if self._next_frame is not None else -1
+        if 0 <= skip <= MAX_GRABBED_FRAMES:
+            # Close ahead, grab the frames in between without retrieving them (seeking decodes from the previous keyframe)
+            for _ in range(skip):
+                if not self.capture.grab():
+                    self._next_frame = None
+                    return None
+        else: self.capture.set(1, frame) # Set the frame number within the VideoCapture object
+        success, image = self.capture.read(self._decode_buffer)
+        self._next_frame = frame+1 if success else None
+        if not success: return None
+        self._decode_buffer = image # Each frame is converted to a separate RGB array, so this one can be decoded into again
+        return image
+
+    def _decode_frame(self, frame):
+        """Internal function to get a frame as RGB image, returns None if it could not be read"""
+        # Serve recently viewed frames from the cache, so flipping back and forth does not decode them again
+        if frame in self._frame_cache:
+            self._frame_cache.move_to_end(frame)
+            return self._frame_cache[frame]
+        image = self._read_frame(frame)
+        if image is None: return None
+        # Convert image data to RGB, contiguous data renders much faster than a channel-reversed view
+        # The conversion writes into the buffer of a frame that is no longer used, so no new array is allocated
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._spare_buffer)
+        self._spare_buffer = None
+        if self.frame_cache_size > 0:
+            self._frame_cache[frame] = image
+            if len(self._frame_cache) > self.frame_cache_size: self._spare_buffer = self._frame_cache.popitem(last=False)[1]
+        else: self._spare_buffer = image # Nothing is cached, the next frame replaces this one on screen anyway
+        return image
 
     def _change_frame(self, frame):
         """Internal function to change the frame currently visible"""
-        self.capture.set(1, frame) # Set the frame number within the VideoCapture object
-        success, image = self.capture.read()
-        if not success: return False
-        # Convert image data to RGB
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = self._decode_frame(frame)
+        if image is None: return False
         self.plotwidget.set_image(image)
 
         # Set frame label to correct frame number
@@ -457,10 +591,24 @@ class VideoWindow(ImageWindow):
         self.frame = frame
         return True
 
+    def _schedule_prefetch(self):
+        """Internal function to decode the frame auto-progressing moves to next once the current frame is shown"""
+        # Only called after auto-progressing forward, reading ahead elsewhere would make the next arrow key step seek
+        # The VideoCapture object is not thread-safe, so the frame is decoded on the event loop while the user is clicking
+        # At least two cached frames are needed, otherwise the prefetched frame would recycle the buffer on screen
+        if self.frame_cache_size > 1: QtCore.QTimer.singleShot(0, self._prefetch_frame)
+
+    def _prefetch_frame(self):
+        """Internal function to decode the next auto-progress frame into the frame cache"""
+        frame = self.frame + self.auto_progress_frame_interval
+        if frame <= self.max_frame and frame not in self._frame_cache: self._decode_frame(frame)
+
     def _auto_progress_handler(self, _):
         """Internal function as listener for the button click event from PyQtGraph, only triggers when a point is placed"""
         # If 'auto_progress' is true, move to next frame
-        if self.auto_progress and not self._change_frame(self.frame + self.auto_progress_frame_interval): 
+        if not self.auto_progress: return
+        if self._change_frame(self.frame + self.auto_progress_frame_interval): self._schedule_prefetch()
+        else:
             msg = QtWidgets.QMessageBox()
             msg.setIcon(QtWidgets.QMessageBox.Critical)
             msg.setText('Cannot move any further!')
@@ -468,7 +616,17 @@ class VideoWindow(ImageWindow):
             msg.setWindowTitle('ImageP Error')
             msg.exec_()
 
-def gui(path, origin=None, calibration=(1, 1), unit='px', color='w', frame=0, auto_progress=False, auto_progress_frame_interval=10):
+def _image_origin(origin, height):
+    """Internal function to convert an origin as returned by the GUI to a position in the image"""
+    # The origin point was returned calibrated from the (0, 0) origin, we have to compensate for that...
+    return (origin[0], height-origin[1]) if origin is not None else (0, height)
+
+def _get_application():
+    """Internal function that returns the Qt application, it is only created on the first call"""
+    # Reuse the previous instance if available, otherwise the kernel dies in Jupyter notebooks
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+def gui(path, origin=None, calibration=(1, 1), unit='px', color='w', frame=0, auto_progress=False, auto_progress_frame_interval=10, frame_cache_size=16, backend=cv2.CAP_ANY):
     """
     Function that opens the GUI of ImageP. Returns array with calibrated clicked points relative to the origin.
     Parameters:
@@ -482,27 +640,25 @@ def gui(path, origin=None, calibration=(1, 1), unit='px', color='w', frame=0, au
         - 'frame': The frame to start the program from (0 by default).
         - 'auto_progress': Automatically progress to the next frame after clicking (false by default).
         - 'auto_progress_frame_interval': Frames that are skipped when auto-progressing (10 frames per click by default).
+        - 'frame_cache_size': Number of recently viewed frames kept in memory for quick flipping (16 by default, 0 to disable), when auto-progressing the next frame is decoded ahead into it.
+        - 'backend': OpenCV video capture backend, e.g. cv2.CAP_FFMPEG (cv2.CAP_ANY by default).
 
     'origin', 'calibration' and 'unit' can also be defined from within the GUI.
    """
 
     try:
-        # Load the image
-        image = cv2.imread(path)
+        # Load the image, decoding from a memory-mapped view of the file so the encoded bytes are never copied
+        image = cv2.imdecode(np.memmap(path, dtype=np.uint8, mode='r'), cv2.IMREAD_COLOR)
         if image is None: raise Exception
-        # Convert image data to RGB for Matplotlib
+        # Convert image data from BGR to RGB, contiguous data renders much faster than a channel-reversed view
         image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
-        # The origin point was returned calibrated from the (0, 0) origin, we have to compensate for that...
         # 16 May 2021:  Removed unit origin as we cannot know the previous origin, therefore we cannot
         #               compensate for it properly.
-        if origin is not None: origin = (origin[0], image.shape[0]-origin[1]) 
-        else: origin = (0, image.shape[0])
+        origin = _image_origin(origin, image.shape[0])
 
         # Launch the GUI application
-        # Use previous instance if available
-        if not QtWidgets.QApplication.instance(): app = QtWidgets.QApplication(sys.argv)
-        else: app = QtWidgets.QApplication.instance()
+        app = _get_application()
         window = ImageWindow(image, origin, calibration, unit, color)
         window.init_gui()
         window.show()
@@ -512,13 +668,13 @@ def gui(path, origin=None, calibration=(1, 1), unit='px', color='w', frame=0, au
         return window.get_calibrated_points()
     except Exception as e:
         # If it is not an image, try to load the video
-        capture = cv2.VideoCapture(path)
+        # Ask for hardware accelerated decoding when supported (OpenCV 4.5.2 and up), this falls back to software decoding
+        if hasattr(cv2, 'VIDEO_ACCELERATION_ANY'): capture = cv2.VideoCapture(path, backend, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        else: capture = cv2.VideoCapture(path, backend)
         if not capture.isOpened(): raise FileNotFoundError('The specified file could not be found (or loaded)')
         # Launch the GUI application
-        # Use previous instance if available
-        if not QtWidgets.QApplication.instance(): app = QtWidgets.QApplication(sys.argv)
-        else: app = QtWidgets.QApplication.instance()
-        window = VideoWindow(capture, origin, calibration, unit, color, frame, auto_progress, auto_progress_frame_interval)
+        app = _get_application()
+        window = VideoWindow(capture, origin, calibration, unit, color, frame, auto_progress, auto_progress_frame_interval, frame_cache_size)
         window.init_video_gui()
         window.show()
         app.exec_()